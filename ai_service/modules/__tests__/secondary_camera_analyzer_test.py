@@ -282,6 +282,22 @@ class TestSecondaryCameraAnalyzer:
         score = analyzer._calculate_lighting_score(250, 10)
         assert score < 0.5
     
+    def test_lighting_score_rounding_tolerance(self, analyzer):
+        """Memoized lighting score stays within 0.007 of the unrounded formula"""
+        for brightness in np.linspace(0, 255, 97):
+            for contrast in np.linspace(0, 80, 41):
+                exact = (max(0.0, 1.0 - abs(brightness - 130) / 130) + min(1.0, contrast / 50)) / 2
+                assert abs(analyzer._calculate_lighting_score(brightness, contrast) - exact) <= 0.007
+    
+    def test_workspace_compliance_uses_lighting_score(self, analyzer):
+        """Compliance is built from the same lighting score reported in lighting_quality"""
+        brightness, contrast = 101.7, 33.3
+        lighting = analyzer._calculate_lighting_score(brightness, contrast)
+        score = analyzer._calculate_workspace_compliance_score(
+            brightness, contrast, 150, {'workspace_structure_score': 0.6}, {'detections': []}
+        )
+        assert score == pytest.approx((lighting + 1.0 + 0.6) / 3)
+    
     def test_workspace_compliance_score(self, analyzer):
         """Test workspace compliance score calculation"""
         workspace_elements = {'workspace_structure_score': 0.8}
@@ -409,6 +425,36 @@ class TestSecondaryCameraAnalyzer:
         assert 'secondary_camera_hands_not_visible' in violation_types
         assert 'secondary_camera_keyboard_not_visible' in violation_types
     
+    def test_violation_batch_generation(self, analyzer):
+        """Test batched violation generation only reports newly raised violations"""
+        def make_result(hands_visible, keyboard_visible):
+            return {
+                'status': 'success',
+                'analysis': {
+                    'hand_placement': {'hands_visible': hands_visible, 'hands_in_typing_position': True},
+                    'keyboard_visibility': {'keyboard_visible': keyboard_visible},
+                    'face_coverage': {'face_coverage': {'coverage_quality': 'appropriate'}},
+                    'workspace_compliance': {'compliance_score': 0.9}
+                }
+            }
+        
+        results = [
+            make_result(False, True),
+            make_result(False, True),   # still missing hands - not re-reported
+            make_result(True, False),
+            make_result(False, False),  # hands missing again - reported
+        ]
+        
+        violations = analyzer.generate_violations_batch(results)
+        reported = [(v['frame_index'], v['type']) for v in violations]
+        
+        assert reported == [
+            (0, 'secondary_camera_hands_not_visible'),
+            (2, 'secondary_camera_keyboard_not_visible'),
+            (3, 'secondary_camera_hands_not_visible'),
+        ]
+        assert analyzer.generate_violations_batch([]) == []
+    
     def test_analysis_history_and_stability(self, analyzer, sample_frame):
         """Test analysis history tracking and stability scoring"""
         # Initially no history
@@ -1,14 +1,37 @@
 import unittest
 import numpy as np
 import base64
+import io
+import soundfile as sf
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import importlib.util
+import time
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from speech_recognition import SpeechRecognizer
+import speech_recognition
+from speech_recognition import SpeechRecognizer, _codepoints, _levenshtein_py
+
+def _reference_levenshtein(a, b):
+    """Textbook full-matrix Levenshtein DP, the oracle for the optimized kernels"""
+    dp = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+    return dp[len(a)][len(b)]
+
+# (a, b) string pairs: empty inputs, classic cases, non-ASCII, and
+# shorter sides past 64 symbols so the bit-parallel masks span several words
+_LEVENSHTEIN_CASES = [
+    ("", ""), ("", "abc"), ("abc", ""), ("a", "a"), ("a", "b"),
+    ("kitten", "sitting"), ("hello", "world"), ("flaw", "lawn"),
+    ("café", "cafe"), ("naïve résumé", "naive resume"), ("日本語のテキスト", "日本語テキスト"),
+    ("🙂👍 ok", "👍 ok 🙂"),
+    ("the quick brown fox jumps over the lazy dog " * 3, "the quick brown cat jumped over a lazy dog " * 3),
+]
 
 class TestSpeechRecognizer(unittest.TestCase):
     def setUp(self):
@@ -109,6 +132,116 @@ class TestSpeechRecognizer(unittest.TestCase):
                 # Verify buffer is reset after analysis
                 self.assertEqual(len(self.speech_recognizer.audio_buffer), 0)
     
+    def test_process_complete_audio_ignores_pending_chunks(self):
+        """A complete upload is analyzed even when streamed chunks are still pending"""
+        stale_chunk = np.full(100, 0.5, dtype=np.float32)
+        recording = np.sin(np.linspace(0, 3000, 48000)).astype(np.float32)  # 3 seconds
+        self.speech_recognizer.is_recording = True
+        self.speech_recognizer.recording_start_time = time.time()
+        
+        with patch('speech_recognition.SpeechRecognizer._decode_audio', side_effect=[stale_chunk, recording]):
+            with patch('speech_recognition.SpeechRecognizer._analyze_audio_quality') as mock_quality:
+                mock_quality.return_value = {
+                    'volume_level': 0.0,
+                    'signal_to_noise': 0.0,
+                    'clarity': 0.0,
+                    'background_noise_level': 0.0,
+                    'overall_quality': 0.0
+                }
+                self.speech_recognizer.process_audio_chunk("stream")
+                self.assertEqual(len(self.speech_recognizer._chunks), 1)
+                
+                result = self.speech_recognizer.process_complete_audio("upload")
+                
+                self.assertEqual(result['status'], 'complete')
+                analyzed = mock_quality.call_args[0][0]
+                self.assertEqual(len(analyzed), len(recording))
+                self.assertEqual(self.speech_recognizer._chunks, [])
+    
+    def _audio_to_wav_base64(self, audio_data):
+        """Encode numpy audio as a base64 WAV file, as the frontend uploads it"""
+        buffer = io.BytesIO()
+        sf.write(buffer, audio_data, self.speech_recognizer.sample_rate, format='WAV', subtype='PCM_16')
+        return base64.b64encode(buffer.getvalue()).decode('utf-8')
+    
+    def test_process_complete_audio_without_speech(self):
+        """Faint room tone scores 0 even though decoding peak-normalizes it"""
+        self.speech_recognizer.current_sentence = "Excellence is not a skill but an attitude"
+        room_tone = (np.random.default_rng(0).standard_normal(48000) * 1e-4).astype(np.float32)
+        
+        with patch('speech_recognition.SpeechRecognizer._transcribe_audio') as mock_transcribe:
+            result = self.speech_recognizer.process_complete_audio(self._audio_to_wav_base64(room_tone))
+            mock_transcribe.assert_not_called()
+        
+        self.assertEqual(result['status'], 'complete')
+        self.assertEqual(result['recognition_accuracy'], 0.0)
+        self.assertFalse(result['is_acceptable'])
+    
+    def test_process_complete_audio_with_speech(self):
+        """Voiced bursts over the same room tone are detected and transcribed"""
+        sentence = "Excellence is not a skill but an attitude"
+        self.speech_recognizer.current_sentence = sentence
+        rng = np.random.default_rng(0)
+        recording = rng.standard_normal(48000) * 1e-4
+        t = np.arange(8000) / 16000
+        for start in (8000, 20000, 32000):
+            recording[start:start + 8000] += 0.3 * np.sin(2 * np.pi * 220 * t)
+        
+        with patch('speech_recognition.SpeechRecognizer._transcribe_audio', return_value=sentence) as mock_transcribe:
+            result = self.speech_recognizer.process_complete_audio(
+                self._audio_to_wav_base64(recording.astype(np.float32))
+            )
+            mock_transcribe.assert_called_once()
+            speech = mock_transcribe.call_args[0][1]
+            # Silent head and tail are cropped before the engines
+            self.assertLess(len(speech), len(recording))
+        
+        self.assertEqual(result['status'], 'complete')
+        self.assertGreater(result['recognition_accuracy'], 0.9)
+
+    def test_transcribe_audio_loads_whisper_outside_timeout(self):
+        """A cold Whisper load slower than the timeout does not abandon the first result"""
+        sentence = "Excellence is not a skill but an attitude"
+        recognizer = self.speech_recognizer
+        recognizer.transcription_timeout = 0.5
+        audio = (0.3 * np.sin(2 * np.pi * 220 * np.arange(32000) / 16000)).astype(np.float32)
+
+        def slow_load():
+            time.sleep(1.0)
+            recognizer.whisper_model = MagicMock()
+            recognizer.whisper_backend = 'whisper'
+            recognizer._run_whisper = lambda _: sentence
+
+        with patch('speech_recognition.WHISPER_AVAILABLE', True):
+            with patch.object(recognizer, '_load_whisper_model', side_effect=slow_load) as mock_load:
+                with patch.object(recognizer, '_transcribe_with_google', return_value=None):
+                    result = recognizer._transcribe_audio(audio, speech=audio)
+                mock_load.assert_called_once()
+
+        self.assertEqual(result, sentence)
+
+    @unittest.skipUnless(importlib.util.find_spec('torch'), "torch not installed")
+    def test_quantize_whisper_int8_converts_linear_subclasses(self):
+        """whisper's nn.Linear subclass layers end up as dynamic int8 Linear modules"""
+        import torch
+        from speech_recognition import _quantize_whisper_int8
+        
+        class WhisperLinear(torch.nn.Linear):
+            """Mirrors whisper.model.Linear: casts weights to the input dtype"""
+            def forward(self, x):
+                bias = None if self.bias is None else self.bias.to(x.dtype)
+                return torch.nn.functional.linear(x, self.weight.to(x.dtype), bias)
+        
+        model = torch.nn.Sequential(WhisperLinear(16, 16), torch.nn.ReLU(), WhisperLinear(16, 4, bias=False))
+        x = torch.randn(8, 16)
+        expected = model(x).detach()
+        
+        quantized = _quantize_whisper_int8(model)
+        
+        self.assertIsInstance(quantized[0], torch.ao.nn.quantized.dynamic.Linear)
+        self.assertIsInstance(quantized[2], torch.ao.nn.quantized.dynamic.Linear)
+        torch.testing.assert_close(quantized(x), expected, atol=0.1, rtol=0.1)
+    
     def test_analyze_audio_quality(self):
         """Test audio quality analysis"""
         quality = self.speech_recognizer._analyze_audio_quality(self.test_audio)
@@ -212,6 +345,36 @@ class TestSpeechRecognizer(unittest.TestCase):
         distance = self.speech_recognizer.calculate_levenshtein_distance("hello", "")
         self.assertEqual(distance, 5)
     
+    def _levenshtein_word_cases(self):
+        """Word-id sequence pairs, including repeated words and empty sides"""
+        rng = np.random.default_rng(0)
+        cases = [([], []), ([], [0, 1]), ([3, 3, 3], [3]), ([0, 1, 2, 3], [3, 2, 1, 0])]
+        for n, m in ((5, 7), (40, 38), (70, 90), (130, 65)):
+            cases.append((rng.integers(0, 6, n).tolist(), rng.integers(0, 6, m).tolist()))
+        return cases
+
+    def test_levenshtein_py_matches_reference(self):
+        """Bit-parallel pure Python distance equals the full DP on strings and word ids"""
+        for a, b in _LEVENSHTEIN_CASES:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(_levenshtein_py(a, b), _reference_levenshtein(a, b))
+                self.assertEqual(_levenshtein_py(b, a), _reference_levenshtein(a, b))
+        for a, b in self._levenshtein_word_cases():
+            with self.subTest(a=a, b=b):
+                self.assertEqual(_levenshtein_py(a, b), _reference_levenshtein(a, b))
+
+    @unittest.skipUnless(speech_recognition.NUMBA_AVAILABLE, "numba not installed")
+    def test_levenshtein_kernel_matches_reference(self):
+        """numba kernel equals the full DP on code point and int32 word-id arrays"""
+        kernel = speech_recognition._levenshtein_kernel
+        for a, b in _LEVENSHTEIN_CASES:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(int(kernel(_codepoints(a), _codepoints(b))), _reference_levenshtein(a, b))
+        for a, b in self._levenshtein_word_cases():
+            with self.subTest(a=a, b=b):
+                expected = _reference_levenshtein(a, b)
+                self.assertEqual(int(kernel(np.array(a, dtype=np.int32), np.array(b, dtype=np.int32))), expected)
+
     def test_reset(self):
         """Test resetting the speech recognizer state"""
         # Set up some state
@@ -0,0 +1,38 @@
+"""
+Numeric scoring kernels for the secondary camera analyzer.
+
+The functions here are plain Python so they can be imported without numba.
+Running this file compiles them ahead of time into the native `scoring_aot`
+extension module (next to this file) with numba.pycc:
+
+    python modules/_scoring_aot.py
+"""
+import os
+
+
+def workspace_compliance(lighting_score, blur_score,
+                         workspace_structure_score, n_prohibited):
+    """Numeric core of the workspace compliance score (lighting + sharpness + workspace - penalty)"""
+    sharpness_score = 1.0 if blur_score > 100.0 else blur_score / 100.0
+
+    compliance_score = (lighting_score + sharpness_score + workspace_structure_score) / 3.0
+    # Penalty for prohibited objects
+    return max(0.0, compliance_score - n_prohibited * 0.2)
+
+
+WORKSPACE_COMPLIANCE_SIGNATURE = 'f8(f8,f8,f8,i8)'
+
+
+def build():
+    """Compile the kernels into the native scoring_aot extension"""
+    from numba.pycc import CC
+
+    cc = CC('scoring_aot')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('workspace_compliance', WORKSPACE_COMPLIANCE_SIGNATURE)(workspace_compliance)
+    cc.compile()
+    print(f"[SCORING_AOT] Built scoring_aot in {cc.output_dir}")
+
+
+if __name__ == '__main__':
+    build()
@@ -1,5 +1,4 @@
 import numpy as np
-import librosa
 import soundfile as sf
 from typing import Dict, List, Tuple
 # import tensorflow as tf
@@ -23,10 +22,18 @@ class AudioProcessor:
         self.history_size = 50
         self.excessive_speech_threshold = 0.4  # New threshold for excessive speech
         
+        # Butterworth coefficients per (sample_rate, lowcut, highcut, order), designed once
+        self._filter_cache = {}
+        
         print(f"[AUDIO] Initialized AudioProcessor with frame_length={self.frame_length}, sample_rate={self.sample_rate}")
 
     def _butter_bandpass(self, lowcut: float, highcut: float, order: int = 5) -> Tuple:
-        """Create butterworth bandpass filter"""
+        """Create butterworth bandpass filter (cached: the bands are fixed, so each is designed once)"""
+        key = (self.sample_rate, lowcut, highcut, order)
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            return cached
+        
         nyquist = 0.5 * self.sample_rate
         low = lowcut / nyquist
         high = highcut / nyquist
@@ -44,6 +51,7 @@ class AudioProcessor:
         
         print(f"[AUDIO DEBUG] Filter frequencies: lowcut={lowcut}Hz, highcut={highcut}Hz, normalized: low={low}, high={high}")
         b, a = butter(order, [low, high], btype='band')
+        self._filter_cache[key] = (b, a)
         return b, a
 
     def _apply_bandpass_filter(self, data: np.ndarray, lowcut: float, highcut: float) -> np.ndarray:
@@ -55,11 +63,14 @@ class AudioProcessor:
         """Detect voice activity in audio frame with improved sensitivity"""
         # Normalize audio frame to [-1, 1] range
         max_abs = np.max(np.abs(audio_frame))
-        if max_abs > 0:
-            audio_frame = audio_frame / max_abs
+        if max_abs == 0:
+            # Digital silence (e.g. muted mic): every criterion below scores 0, skip librosa
+            print('[AUDIO] Silent frame - VAD score 0.00')
+            return 0.0
+        audio_frame = audio_frame / max_abs
 
-        # Calculate energy (RMS) with improved normalization
-        energy = np.sqrt(np.mean(audio_frame ** 2))
+        # Calculate energy (RMS) with improved normalization (dot product: no squared temporary)
+        energy = np.sqrt(np.dot(audio_frame, audio_frame) / audio_frame.size)
         normalized_energy = min(1.0, energy * 100)  # Scale up for better detection
         print(f'[AUDIO] Frame energy: {energy:.6f}, Normalized: {normalized_energy:.6f}')
         
@@ -68,6 +79,7 @@ class AudioProcessor:
         zcr = zero_crossings / len(audio_frame)
         
         # Calculate spectral centroid for frequency content analysis
+        import librosa  # deferred: slow to import, only needed once audio arrives
         spectral_centroid = np.mean(librosa.feature.spectral_centroid(
             y=audio_frame, sr=self.sample_rate
         ))
@@ -92,6 +104,9 @@ class AudioProcessor:
     def _detect_suspicious_sounds(self, audio_frame: np.ndarray) -> List[Dict]:
         """Detect suspicious sounds like paper rustling, keyboard typing, whispering"""
         suspicious_sounds = []
+        if not audio_frame.any():
+            # Silent frame: no band can exceed the noise threshold, skip the filters
+            return suspicious_sounds
         
         try:
             # Filter for different frequency ranges (appropriate for 16kHz sample rate)
@@ -242,7 +257,7 @@ class AudioProcessor:
             'metrics': {
                 'voice_activity_level': float(recent_vad),
                 'total_suspicious_sounds': len(suspicious_sounds),
-                'rms_level': float(np.sqrt(np.mean(frame ** 2))),
+                'rms_level': float(np.sqrt(np.dot(frame, frame) / frame.size)),
                 'peak_level': float(np.max(np.abs(frame)))
             }
         }
@@ -289,6 +304,6 @@ class AudioProcessor:
 
     def reset_state(self):
         """Reset the processor's state"""
-        self.audio_buffer = np.array([])
+        self.audio_buffer = np.array([], dtype=np.float32)
         self.vad_buffer = []
         self.sound_history = []
@@ -1,16 +1,39 @@
 import cv2
 import numpy as np
 import base64
-from typing import Dict, List, Tuple, Optional
+import sys
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Tuple, Optional, Union
 import torch
 
+try:
+    from numba import njit, float64, int64
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("[WARNING] numba not available. Using pure Python scoring.")
+
 # Try relative imports first, fall back to absolute imports for testing
 try:
     from .face_detection import FaceDetector
     from .object_detection import ObjectDetector
+    from ._scoring_aot import workspace_compliance as _workspace_compliance_py
 except ImportError:
     from face_detection import FaceDetector
     from object_detection import ObjectDetector
+    from _scoring_aot import workspace_compliance as _workspace_compliance_py
+
+# Native kernels built ahead of time by `python modules/_scoring_aot.py`
+try:
+    try:
+        from .scoring_aot import workspace_compliance as _workspace_compliance_aot
+    except ImportError:
+        from scoring_aot import workspace_compliance as _workspace_compliance_aot
+    SCORING_AOT_AVAILABLE = True
+except ImportError:
+    SCORING_AOT_AVAILABLE = False
 
 def convert_numpy_types(obj):
     """Convert NumPy types to native Python types for JSON serialization"""
@@ -29,6 +52,124 @@ def convert_numpy_types(obj):
     else:
         return obj
 
+# Reciprocals so the lighting score multiplies instead of divides
+_INV_BRIGHTNESS_SPAN = 1.0 / 130.0
+_INV_CONTRAST_TARGET = 1.0 / 50.0
+
+@lru_cache(maxsize=4096)
+def _lighting_score_cached(brightness_q: int, contrast_q: int) -> float:
+    """Lighting score for brightness/contrast rounded to whole units"""
+    # Optimal brightness range: 80-180 (branchless clamp to >= 0)
+    brightness_score = 1.0 - abs(brightness_q - 130) * _INV_BRIGHTNESS_SPAN
+    brightness_score = 0.5 * (brightness_score + abs(brightness_score))
+    
+    # Optimal contrast: > 30 (branchless clamp to <= 1)
+    contrast_score = contrast_q * _INV_CONTRAST_TARGET
+    contrast_score -= 0.5 * (contrast_score - 1.0 + abs(contrast_score - 1.0))
+    
+    return (brightness_score + contrast_score) / 2
+
+# Prefer the AOT-compiled kernel (no JIT warm-up at all), then numba JIT, then pure Python
+if SCORING_AOT_AVAILABLE:
+    _workspace_compliance_kernel = _workspace_compliance_aot
+elif NUMBA_AVAILABLE:
+    # Eager signature compiles at import so the first frame doesn't pay the JIT cost
+    _workspace_compliance_kernel = njit(
+        float64(float64, float64, float64, int64), cache=True, fastmath=True
+    )(_workspace_compliance_py)
+else:
+    _workspace_compliance_kernel = _workspace_compliance_py
+
+# Static violation payloads; copied on hit so callers can still mutate them
+_VIOLATION_TEMPLATES = {
+    'hands_not_visible': MappingProxyType({
+        'type': 'secondary_camera_hands_not_visible',
+        'severity': 'high',
+        'confidence': 0.9,
+        'message': 'Hands not visible in secondary camera view',
+        'source': 'secondary_camera'
+    }),
+    'keyboard_not_visible': MappingProxyType({
+        'type': 'secondary_camera_keyboard_not_visible',
+        'severity': 'high',
+        'confidence': 0.9,
+        'message': 'Keyboard not visible in secondary camera view',
+        'source': 'secondary_camera'
+    }),
+    'excessive_face_detail': MappingProxyType({
+        'type': 'secondary_camera_excessive_face_detail',
+        'severity': 'medium',
+        'confidence': 0.8,
+        'message': 'Secondary camera showing too much facial detail',
+        'source': 'secondary_camera'
+    }),
+    'workspace_non_compliant': MappingProxyType({
+        'type': 'secondary_camera_workspace_non_compliant',
+        'severity': 'medium',
+        'confidence': 0.7,
+        'message': 'Workspace setup not compliant in secondary camera view',
+        'source': 'secondary_camera'
+    }),
+    'hands_not_in_typing_position': MappingProxyType({
+        'type': 'secondary_camera_hands_not_in_typing_position',
+        'severity': 'medium',
+        'confidence': 0.6,
+        'message': 'Hands not positioned appropriately for typing',
+        'source': 'secondary_camera'
+    })
+}
+
+# (bit, template) pairs in the order violations are reported
+_VIOLATION_BITS = tuple(
+    (1 << i, _VIOLATION_TEMPLATES[key])
+    for i, key in enumerate((
+        'hands_not_visible',
+        'keyboard_not_visible',
+        'excessive_face_detail',
+        'workspace_non_compliant',
+        'hands_not_in_typing_position'
+    ))
+)
+_VIOLATION_BIT_VALUES = np.array([bit for bit, _ in _VIOLATION_BITS], dtype=np.uint8)
+
+# Recommendation messages, indexed in the same order as the predicates
+# evaluated in SecondaryCameraAnalyzer._generate_recommendations
+_RECOMMENDATION_MESSAGES = (
+    "Ensure your hands are visible in the secondary camera view",
+    "Position your hands in the typing area for better monitoring",
+    "Adjust camera angle to show your keyboard clearly",
+    "Position keyboard in the lower portion of the camera view",
+    "Adjust secondary camera to show less facial detail (profile view is better)",
+    "Improve lighting in your workspace for better monitoring",
+    "Ensure camera is stable and focused for clear image quality"
+)
+_DEFAULT_RECOMMENDATION = "Secondary camera setup looks good!"
+
+# Weights of the different factors in the overall compliance score
+_WEIGHT_HANDS = 0.3
+_WEIGHT_KEYBOARD = 0.3
+_WEIGHT_FACE = 0.2
+_WEIGHT_WORKSPACE = 0.2
+
+# Interned so producer and consumers share one string object; str == checks
+# identity first, so the common comparison is a single pointer compare while
+# strings that went through JSON still compare correctly
+_TOO_DETAILED = sys.intern('too_detailed')
+
+# Shared read-only default for missing sub-analyses (avoids a fresh {} per lookup)
+_EMPTY = MappingProxyType({})
+
+class WorkspaceScores(NamedTuple):
+    """Numeric workspace inputs read by the compliance score"""
+    workspace_structure_score: float = 0.0
+
+    @classmethod
+    def from_elements(cls, workspace_elements: Union['WorkspaceScores', Dict]) -> 'WorkspaceScores':
+        """Adapt a workspace_elements dict (the JSON payload shape) to WorkspaceScores"""
+        if isinstance(workspace_elements, cls):
+            return workspace_elements
+        return cls(float(workspace_elements.get('workspace_structure_score', 0.0)))
+
 class SecondaryCameraAnalyzer:
     """
     Advanced AI analyzer for secondary camera feed to evaluate:
@@ -48,8 +189,15 @@ class SecondaryCameraAnalyzer:
         self.face_coverage_threshold = 0.6
         
         # History for stability
-        self.analysis_history = []
         self.history_size = 10
+        self.analysis_history = deque(maxlen=self.history_size)
+        
+        # Running sums over the most recent overall scores so the
+        # stability score is O(1) per frame
+        self.stability_window = 5
+        self._recent_scores = deque()
+        self._score_sum = 0.0
+        self._score_sq_sum = 0.0
         
         # Hand detection using skin color and contour analysis
         self.hand_detector_initialized = False
@@ -71,14 +219,14 @@ class SecondaryCameraAnalyzer:
         """Check if frame is black, very dark, or invalid"""
         try:
             # Check if frame is mostly black (average brightness < 10)
-            avg_brightness = np.mean(frame)
+            avg_brightness = frame.mean()
             if avg_brightness < 10:
                 print(f"[SECONDARY_ANALYZER] Black screen detected (brightness: {avg_brightness})")
                 return True
             
             # Check if frame has very low variance (solid color)
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            variance = np.var(gray)
+            variance = gray.var()
             if variance < 10:  # Reduced threshold to allow more realistic frames
                 print(f"[SECONDARY_ANALYZER] Low variance frame detected (variance: {variance})")
                 return True
@@ -499,7 +647,7 @@ class SecondaryCameraAnalyzer:
                 
                 # If no violations in secondary view, it might be showing too much face detail
                 if not violations:
-                    face_coverage_analysis['coverage_quality'] = 'too_detailed'
+                    face_coverage_analysis['coverage_quality'] = _TOO_DETAILED
                     face_coverage_analysis['appropriate_coverage'] = False
                 else:
                     # Some face visibility with violations might be appropriate for secondary view
@@ -538,8 +686,8 @@ class SecondaryCameraAnalyzer:
             object_results = {'detections': [], 'status': 'clear'}
             
             # Analyze lighting and image quality
-            brightness = np.mean(frame)
-            contrast = np.std(frame)
+            brightness = frame.mean()
+            contrast = frame.std()
             
             # Check for motion blur (using Laplacian variance)
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
@@ -566,7 +714,8 @@ class SecondaryCameraAnalyzer:
                 'workspace_elements': workspace_visible,
                 'prohibited_objects': object_results.get('detections', []),
                 'compliance_score': self._calculate_workspace_compliance_score(
-                    brightness, contrast, blur_score, workspace_visible, object_results
+                    brightness, contrast, blur_score,
+                    WorkspaceScores.from_elements(workspace_visible), object_results
                 ),
                 'analysis_quality': 'good'
             }
@@ -622,55 +771,41 @@ class SecondaryCameraAnalyzer:
     
     def _calculate_lighting_score(self, brightness: float, contrast: float) -> float:
         """Calculate lighting quality score"""
-        # Optimal brightness range: 80-180
-        brightness_score = 1.0 - abs(brightness - 130) / 130
-        brightness_score = max(0.0, brightness_score)
-        
-        # Optimal contrast: > 30
-        contrast_score = min(1.0, contrast / 50)
-        
-        return (brightness_score + contrast_score) / 2
+        # Lighting drifts slowly between frames, so round to whole units and reuse
+        # the cached score (within 0.007 of the unrounded formula)
+        return _lighting_score_cached(int(round(brightness)), int(round(contrast)))
     
     def _calculate_workspace_compliance_score(self, brightness: float, contrast: float, 
-                                           blur_score: float, workspace_elements: Dict, 
+                                           blur_score: float,
+                                           workspace_elements: Union[WorkspaceScores, Dict],
                                            object_results: Dict) -> float:
         """Calculate overall workspace compliance score"""
-        lighting_score = self._calculate_lighting_score(brightness, contrast)
-        sharpness_score = 1.0 if blur_score > 100 else blur_score / 100
-        workspace_score = workspace_elements.get('workspace_structure_score', 0.0)
-        
-        # Penalty for prohibited objects
-        prohibited_penalty = len(object_results.get('detections', [])) * 0.2
-        
-        compliance_score = (lighting_score + sharpness_score + workspace_score) / 3
-        compliance_score = max(0.0, compliance_score - prohibited_penalty)
-        
-        return compliance_score
+        structure_score, = WorkspaceScores.from_elements(workspace_elements)
+        # Same memoized lighting score as lighting_quality, so a frame has one value
+        return _workspace_compliance_kernel(
+            self._calculate_lighting_score(brightness, contrast),
+            float(blur_score),
+            structure_score,
+            len(object_results.get('detections', []))
+        )
     
     def _calculate_overall_compliance(self, hand_analysis: Dict, keyboard_analysis: Dict,
                                     face_analysis: Dict, workspace_analysis: Dict) -> Dict:
         """Calculate overall compliance score and status"""
         
-        # Weight different factors
-        weights = {
-            'hands': 0.3,
-            'keyboard': 0.3,
-            'face': 0.2,
-            'workspace': 0.2
-        }
-        
         # Calculate individual scores
         hand_score = hand_analysis.get('confidence', 0.0) if hand_analysis.get('hands_visible', False) else 0.0
         keyboard_score = keyboard_analysis.get('confidence', 0.0) if keyboard_analysis.get('keyboard_visible', False) else 0.0
-        face_score = 1.0 if face_analysis.get('face_coverage', {}).get('appropriate_coverage', False) else 0.5
+        face_coverage = face_analysis.get('face_coverage') or _EMPTY
+        face_score = 1.0 if face_coverage.get('appropriate_coverage', False) else 0.5
         workspace_score = workspace_analysis.get('compliance_score', 0.0)
         
         # Calculate weighted overall score
         overall_score = (
-            hand_score * weights['hands'] +
-            keyboard_score * weights['keyboard'] +
-            face_score * weights['face'] +
-            workspace_score * weights['workspace']
+            hand_score * _WEIGHT_HANDS +
+            keyboard_score * _WEIGHT_KEYBOARD +
+            face_score * _WEIGHT_FACE +
+            workspace_score * _WEIGHT_WORKSPACE
         )
         
         # More lenient compliance status for violation suppression
@@ -696,46 +831,42 @@ class SecondaryCameraAnalyzer:
     
     def _generate_recommendations(self, analysis_result: Dict) -> List[str]:
         """Generate actionable recommendations based on analysis"""
-        recommendations = []
-        
-        hand_analysis = analysis_result.get('hand_placement', {})
-        keyboard_analysis = analysis_result.get('keyboard_visibility', {})
-        face_analysis = analysis_result.get('face_coverage', {})
-        workspace_analysis = analysis_result.get('workspace_compliance', {})
-        
-        # Hand placement recommendations
-        if not hand_analysis.get('hands_visible', False):
-            recommendations.append("Ensure your hands are visible in the secondary camera view")
-        elif not hand_analysis.get('hands_in_typing_position', False):
-            recommendations.append("Position your hands in the typing area for better monitoring")
-        
-        # Keyboard recommendations
-        if not keyboard_analysis.get('keyboard_visible', False):
-            recommendations.append("Adjust camera angle to show your keyboard clearly")
-        elif keyboard_analysis.get('positioning_score', 0) < 0.5:
-            recommendations.append("Position keyboard in the lower portion of the camera view")
-        
-        # Face coverage recommendations
-        face_coverage = face_analysis.get('face_coverage', {})
-        if face_coverage.get('coverage_quality') == 'too_detailed':
-            recommendations.append("Adjust secondary camera to show less facial detail (profile view is better)")
-        
-        # Workspace recommendations
-        lighting = workspace_analysis.get('lighting_quality', {})
-        if lighting.get('quality_score', 0) < 0.6:
-            recommendations.append("Improve lighting in your workspace for better monitoring")
-        
-        if not workspace_analysis.get('image_quality', {}).get('is_sharp', True):
-            recommendations.append("Ensure camera is stable and focused for clear image quality")
+        hand_analysis = analysis_result.get('hand_placement') or _EMPTY
+        keyboard_analysis = analysis_result.get('keyboard_visibility') or _EMPTY
+        face_analysis = analysis_result.get('face_coverage') or _EMPTY
+        workspace_analysis = analysis_result.get('workspace_compliance') or _EMPTY
+        
+        hands_visible = hand_analysis.get('hands_visible', False)
+        keyboard_visible = keyboard_analysis.get('keyboard_visible', False)
+        face_coverage = face_analysis.get('face_coverage') or _EMPTY
+        lighting = workspace_analysis.get('lighting_quality') or _EMPTY
+        image_quality = workspace_analysis.get('image_quality') or _EMPTY
+        
+        # Predicates line up with _RECOMMENDATION_MESSAGES
+        flags = (
+            # Hand placement recommendations
+            not hands_visible,
+            hands_visible and not hand_analysis.get('hands_in_typing_position', False),
+            # Keyboard recommendations
+            not keyboard_visible,
+            keyboard_visible and keyboard_analysis.get('positioning_score', 0) < 0.5,
+            # Face coverage recommendations
+            face_coverage.get('coverage_quality') == _TOO_DETAILED,
+            # Workspace recommendations
+            lighting.get('quality_score', 0) < 0.6,
+            not image_quality.get('is_sharp', True)
+        )
+        
+        recommendations = [msg for flag, msg in zip(flags, _RECOMMENDATION_MESSAGES) if flag]
         
         if not recommendations:
-            recommendations.append("Secondary camera setup looks good!")
+            recommendations.append(_DEFAULT_RECOMMENDATION)
         
         return recommendations
     
     def _assess_violation_risk(self, analysis_result: Dict) -> Dict:
         """Assess risk of violations based on current setup"""
-        overall_compliance = analysis_result.get('overall_compliance', {})
+        overall_compliance = analysis_result.get('overall_compliance') or _EMPTY
         overall_score = overall_compliance.get('overall_score', 0.0)
         
         # More lenient risk assessment for violation suppression
@@ -759,93 +890,103 @@ class SecondaryCameraAnalyzer:
             'prevention_effectiveness': overall_score
         }
     
+    def _violation_flags(self, analysis_result: Dict) -> int:
+        """Evaluate all secondary camera violation conditions into a bitmask"""
+        if analysis_result.get('status') != 'success':
+            return 0
+        
+        analysis = analysis_result.get('analysis') or _EMPTY
+        hand_analysis = analysis.get('hand_placement') or _EMPTY
+        keyboard_analysis = analysis.get('keyboard_visibility') or _EMPTY
+        face_analysis = analysis.get('face_coverage') or _EMPTY
+        workspace_analysis = analysis.get('workspace_compliance') or _EMPTY
+        
+        hands_visible = hand_analysis.get('hands_visible', False)
+        face_coverage = face_analysis.get('face_coverage') or _EMPTY
+        flags = 0
+        flags |= (not hands_visible) << 0
+        flags |= (not keyboard_analysis.get('keyboard_visible', False)) << 1
+        # Inappropriate face coverage (too much detail in secondary view)
+        flags |= (face_coverage.get('coverage_quality') == _TOO_DETAILED) << 2
+        # Workspace compliance issues
+        flags |= (workspace_analysis.get('compliance_score', 1.0) < 0.4) << 3
+        # Poor hand positioning
+        flags |= (bool(hands_visible) and not hand_analysis.get('hands_in_typing_position', False)) << 4
+        
+        return flags
+    
     def generate_secondary_camera_violations(self, analysis_result: Dict) -> List[Dict]:
         """Generate violations based on secondary camera analysis"""
         violations = []
         
-        if analysis_result.get('status') != 'success':
+        # Gather all conditions into a bitmask first, then emit violations for set bits
+        flags = self._violation_flags(analysis_result)
+        
+        # Fully compliant frame (or failed analysis) - nothing to report
+        if not flags:
             return violations
         
-        analysis = analysis_result.get('analysis', {})
-        hand_analysis = analysis.get('hand_placement', {})
-        keyboard_analysis = analysis.get('keyboard_visibility', {})
-        face_analysis = analysis.get('face_coverage', {})
-        workspace_analysis = analysis.get('workspace_compliance', {})
-        
-        # Generate violations for missing elements
-        if not hand_analysis.get('hands_visible', False):
-            violations.append({
-                'type': 'secondary_camera_hands_not_visible',
-                'severity': 'high',
-                'confidence': 0.9,
-                'message': 'Hands not visible in secondary camera view',
-                'source': 'secondary_camera'
-            })
-        
-        if not keyboard_analysis.get('keyboard_visible', False):
-            violations.append({
-                'type': 'secondary_camera_keyboard_not_visible',
-                'severity': 'high', 
-                'confidence': 0.9,
-                'message': 'Keyboard not visible in secondary camera view',
-                'source': 'secondary_camera'
-            })
-        
-        # Check for inappropriate face coverage (too much detail in secondary view)
-        face_coverage = face_analysis.get('face_coverage', {})
-        if face_coverage.get('coverage_quality') == 'too_detailed':
-            violations.append({
-                'type': 'secondary_camera_excessive_face_detail',
-                'severity': 'medium',
-                'confidence': 0.8,
-                'message': 'Secondary camera showing too much facial detail',
-                'source': 'secondary_camera'
-            })
-        
-        # Check workspace compliance issues
-        workspace_score = workspace_analysis.get('compliance_score', 1.0)
-        if workspace_score < 0.4:
-            violations.append({
-                'type': 'secondary_camera_workspace_non_compliant',
-                'severity': 'medium',
-                'confidence': 0.7,
-                'message': 'Workspace setup not compliant in secondary camera view',
-                'source': 'secondary_camera'
-            })
-        
-        # Check for poor hand positioning
-        if hand_analysis.get('hands_visible', False) and not hand_analysis.get('hands_in_typing_position', False):
-            violations.append({
-                'type': 'secondary_camera_hands_not_in_typing_position',
-                'severity': 'medium',
-                'confidence': 0.6,
-                'message': 'Hands not positioned appropriately for typing',
-                'source': 'secondary_camera'
-            })
+        for bit, template in _VIOLATION_BITS:
+            if flags & bit:
+                violations.append(dict(template))
+        
+        return violations
+    
+    def generate_violations_batch(self, analysis_results: List[Dict]) -> List[Dict]:
+        """
+        Generate violations over a window of consecutive analyses.
+        Only violations that newly appear (were not active in the previous
+        frame) are reported, each tagged with its 'frame_index'.
+        """
+        violations = []
+        if not analysis_results:
+            return violations
+        
+        flags = np.fromiter(
+            (self._violation_flags(result) for result in analysis_results),
+            dtype=np.uint8, count=len(analysis_results)
+        )
+        
+        # (N, num_violation_types) matrix of active conditions
+        active = (flags[:, None] & _VIOLATION_BIT_VALUES) != 0
+        
+        # Rising edges: active now but not in the previous frame
+        raised = active.copy()
+        raised[1:] &= ~active[:-1]
+        
+        for frame_index, violation_index in np.argwhere(raised):
+            violation = dict(_VIOLATION_BITS[violation_index][1])
+            violation['frame_index'] = int(frame_index)
+            violations.append(violation)
         
         return violations
     
     def _update_analysis_history(self, analysis_result: Dict):
         """Update analysis history for stability tracking"""
-        self.analysis_history.append(analysis_result)
-        if len(self.analysis_history) > self.history_size:
-            self.analysis_history.pop(0)
+        self.analysis_history.append(analysis_result)  # deque evicts the oldest entry
+        
+        # Roll the stability window: add the new score, drop the evicted one
+        score = float((analysis_result.get('overall_compliance') or _EMPTY).get('overall_score', 0.0))
+        self._recent_scores.append(score)
+        self._score_sum += score
+        self._score_sq_sum += score * score
+        if len(self._recent_scores) > self.stability_window:
+            evicted = self._recent_scores.popleft()
+            self._score_sum -= evicted
+            self._score_sq_sum -= evicted * evicted
     
     def _calculate_stability_score(self) -> float:
         """Calculate stability score based on recent analysis history"""
         if len(self.analysis_history) < 3:
             return 0.5  # Not enough history
         
-        # Calculate variance in overall scores
-        scores = [
-            result.get('overall_compliance', {}).get('overall_score', 0.0)
-            for result in self.analysis_history[-5:]  # Last 5 analyses
-        ]
-        
-        if not scores:
+        n = len(self._recent_scores)
+        if not n:
             return 0.5
         
-        variance = np.var(scores)
+        # Variance of the last few overall scores from the running sums
+        mean = self._score_sum / n
+        variance = max(0.0, self._score_sq_sum / n - mean * mean)
         stability_score = max(0.0, 1.0 - variance * 2)  # Lower variance = higher stability
         
         return stability_score
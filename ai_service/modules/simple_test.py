@@ -1,7 +1,15 @@
-from face_detection import FaceDetector
+import os
+from unittest.mock import MagicMock
 
 def test_face_detection():
-    detector = FaceDetector()
+    if os.environ.get('FACE_DETECTION_MOCK'):
+        # Skip loading OpenCV/dlib entirely for quick sanity runs
+        detector = MagicMock()
+        detector.analyze_frame.return_value = {'faces_detected': 0, 'violations': []}
+    else:
+        # Imported lazily so merely importing this module doesn't pull in OpenCV/dlib
+        from face_detection import FaceDetector
+        detector = FaceDetector()
     
     # Test no face detection
     print("\nTesting no face detection:")